@@ -1,39 +1,178 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, request, jsonify, render_template, stream_with_context
 from flask_cors import CORS
+from werkzeug.datastructures import FileStorage
 import pandas as pd
+from pandas.api.types import union_categoricals
+import numpy as np
 import io
-import base64
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
+try:
+    import pybase64 as base64  # SIMD-accelerated drop-in for the stdlib module
+except ImportError:
+    import base64
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from datetime import datetime
-import json
+from flask import json  # Flask's encoder also serializes dates/timestamps
 import os
 import tempfile
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import requests
 
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+try:
+    from pyarrow import ArrowInvalid  # pyarrow is only needed as the read_csv engine
+    CSV_ENGINE = "pyarrow"  # multi-threaded CSV parser
+    # pandas < 2.2 lets pyarrow's parse errors through unwrapped
+    CSV_ENGINE_ERRORS = (pd.errors.ParserError, ArrowInvalid)
+except ImportError:
+    CSV_ENGINE = "c"
+    CSV_ENGINE_ERRORS = (pd.errors.ParserError,)
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+REQUIRED_COLUMNS = ["Date", "Exercise Name", "Weight", "Reps"]
+CSV_DTYPES = {"Exercise Name": "category", "Weight": "float64", "Reps": "float64"}
+
+# Uploads bigger than this are parsed in row chunks to bound worker memory
+CSV_STREAM_THRESHOLD_BYTES = 16 * 1024 * 1024
+CSV_CHUNK_ROWS = 50_000
+HASH_BLOCK_BYTES = 1024 * 1024
+
+# Cleaned dataframes keyed by a hash of the uploaded bytes (least recently used first),
+# stored as (df, nbytes). The budget is per worker process; a frame bigger than the
+# whole budget is returned uncached. Cached frames are shared between requests, so
+# callers must not modify them in place.
+DF_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_df_cache = OrderedDict()
+_df_cache_bytes = 0
+_df_cache_lock = threading.Lock()
+
+# Exercises with at least this many sets use the compiled numba kernel when available
+NUMBA_MIN_SETS = 50_000
+ANALYSIS_MODE_CODES = {'weight': 0, '1rm': 1, 'volume': 2}
+
+# One reusable matplotlib figure per thread; pyplot's global state is never touched
+_plot_state = threading.local()
+
+# CSV parsing for /api/analyze starts here while the request thread streams progress
+executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+
 def estimate_1rm(weight, reps):
-    """Epley formula for 1RM estimation."""
+    """Epley formula for 1RM estimation (works on scalars or whole columns)."""
     return weight * (1 + reps / 30.0)
 
+def _clean_sets(df):
+    """Coerce dates and keep only complete sets with positive weight and reps."""
+    # Process dates (kept as datetime64, truncated to the calendar day)
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.normalize()
+
+    # Valid sets only, as one combined mask and a single slice
+    mask = (df["Date"].notna() & df["Exercise Name"].notna()
+            & (df["Weight"] > 0) & (df["Reps"] > 0))
+    return df.loc[mask]
+
+def parse_csv(stream, size):
+    """Parse an uploaded CSV stream of `size` bytes into a dataframe of valid sets."""
+    header = pd.read_csv(stream, nrows=0).columns
+    if not all(col in header for col in REQUIRED_COLUMNS):
+        raise ValueError("CSV must contain Date, Exercise Name, Weight, and Reps columns")
+    stream.seek(0)
+
+    # Only the columns the app uses; exercise names stored as categorical codes
+    read_options = {"usecols": REQUIRED_COLUMNS, "dtype": CSV_DTYPES, "parse_dates": ["Date"]}
+
+    if size <= CSV_STREAM_THRESHOLD_BYTES:
+        try:
+            return _clean_sets(pd.read_csv(stream, engine=CSV_ENGINE, **read_options))
+        except CSV_ENGINE_ERRORS:
+            if CSV_ENGINE == "c":
+                raise
+            # pyarrow's parallel chunker can't follow multi-line quoted notes;
+            # the C engine handles them, so re-read the upload with it
+            stream.seek(0)
+            return _clean_sets(pd.read_csv(stream, **read_options))
+
+    # Large upload: clean chunk by chunk so only valid sets are held in memory
+    # (the pyarrow engine can't read in chunks, so this uses the C engine)
+    chunks = [_clean_sets(chunk) for chunk in pd.read_csv(stream, chunksize=CSV_CHUNK_ROWS, **read_options)]
+    df = pd.concat(chunks, ignore_index=True)
+    # Chunks may carry different category sets (concat then falls back to strings),
+    # and exercises whose sets were all filtered out linger as categories: union the
+    # chunks' categoricals and keep only the names that still have rows
+    df["Exercise Name"] = union_categoricals(
+        [chunk["Exercise Name"] for chunk in chunks]
+    ).remove_unused_categories()
+    return df
+
+def load_and_clean(file):
+    """Return the cleaned dataframe of valid sets for an uploaded CSV.
+
+    This is the single read/validate/clean path shared by every endpoint. Each
+    distinct upload is parsed once and then served from the cache; a CSV without
+    the required columns raises ValueError.
+    """
+    # Hash the upload block by block rather than reading it into memory
+    stream = file.stream
+    hasher = hashlib.blake2b(digest_size=16)
+    size = 0
+    for block in iter(lambda: stream.read(HASH_BLOCK_BYTES), b""):
+        hasher.update(block)
+        size += len(block)
+    key = hasher.hexdigest()
+
+    with _df_cache_lock:
+        if key in _df_cache:
+            _df_cache.move_to_end(key)
+            return _df_cache[key][0]
+
+    stream.seek(0)
+    df = parse_csv(stream, size)
+    _cache_df(key, df)
+
+    return df
+
+def _cache_df(key, df):
+    """Add a cleaned frame to the cache, evicting old entries to stay within budget."""
+    global _df_cache_bytes
+    nbytes = int(df.memory_usage(deep=True).sum())
+    if nbytes > DF_CACHE_MAX_BYTES:
+        return
+
+    with _df_cache_lock:
+        if key in _df_cache:  # parsed concurrently by another request
+            return
+        _df_cache[key] = (df, nbytes)
+        _df_cache_bytes += nbytes
+        while _df_cache_bytes > DF_CACHE_MAX_BYTES:
+            _, (_, evicted_bytes) = _df_cache.popitem(last=False)
+            _df_cache_bytes -= evicted_bytes
+
 def list_exercises(df):
     """Return list of available exercises."""
     return sorted(df["Exercise Name"].dropna().unique().tolist())
 
 def resolve_exercise_name(df, query):
     """Resolve exercise name with fuzzy matching."""
-    all_exercises = df["Exercise Name"].dropna().unique()
+    all_exercises = np.asarray(df["Exercise Name"].dropna().unique(), dtype=object)
+    all_lower = np.char.lower(all_exercises.astype(str))
+    q = query.lower()
 
     # Exact (case-insensitive)
-    exact = [ex for ex in all_exercises if ex.lower() == query.lower()]
-    if exact:
+    exact = all_exercises[all_lower == q]
+    if len(exact):
         return exact[0]
 
     # Partial (case-insensitive)
-    part = [ex for ex in all_exercises if query.lower() in ex.lower()]
+    part = all_exercises[np.char.find(all_lower, q) >= 0].tolist()
     if len(part) == 1:
         return part[0]
     if len(part) > 1:
@@ -43,21 +182,111 @@ def resolve_exercise_name(df, query):
 
 def best_set_per_day(df_one_ex):
     """Return one best set per calendar day (max weight, then reps)."""
-    ranked = df_one_ex.sort_values(["Weight", "Reps"], ascending=[False, False])
-    # one row per day
-    best = ranked.groupby("Date", as_index=False).first()
+    ranked = df_one_ex.sort_values(["Date", "Weight", "Reps"], ascending=[True, False, False])
+    # one row per day: the first row of each date is its best set
+    best = ranked.drop_duplicates(subset="Date", keep="first")
     # Ensure clean dtypes
-    best["Reps"] = best["Reps"].astype(int)
-    return best[["Date", "Weight", "Reps"]].sort_values("Date")
-
-def running_best(series):
-    """Monotonic non-decreasing running max."""
-    out = []
-    current = float("-inf")
-    for v in series:
-        current = max(current, v)
-        out.append(current)
-    return out
+    return best[["Date", "Weight", "Reps"]].astype({"Reps": np.int16})
+
+def session_values(best, analysis_mode):
+    """Per-session value plotted for the analysis mode."""
+    if analysis_mode == '1rm':
+        return estimate_1rm(best["Weight"], best["Reps"])
+    if analysis_mode == 'volume':
+        return best["Weight"] * best["Reps"]
+    return best["Weight"].astype(float)
+
+def _analyze_exercise_kernel(weights, reps, dates_int, mode):
+    """One pass over date-sorted sets: best set per day, its value and the running PR.
+
+    mode follows ANALYSIS_MODE_CODES. Compiled with numba when it is installed.
+    """
+    n = len(dates_int)
+    best_dates = np.empty(n, dtype=np.int64)
+    best_weights = np.empty(n, dtype=np.float64)
+    best_reps = np.empty(n, dtype=np.float64)
+    running_pr = np.empty(n, dtype=np.float64)
+    values = np.empty(n, dtype=np.float64)
+
+    days = 0
+    best_so_far = -np.inf
+    i = 0
+    while i < n:
+        # Best set of this day: max weight, then reps
+        day = dates_int[i]
+        w = weights[i]
+        r = reps[i]
+        i += 1
+        while i < n and dates_int[i] == day:
+            if weights[i] > w or (weights[i] == w and reps[i] > r):
+                w = weights[i]
+                r = reps[i]
+            i += 1
+
+        if mode == 1:
+            value = w * (1 + r / 30.0)
+        elif mode == 2:
+            value = w * r
+        else:
+            value = w
+        best_so_far = max(best_so_far, value)
+
+        best_dates[days] = day
+        best_weights[days] = w
+        best_reps[days] = r
+        values[days] = value
+        running_pr[days] = best_so_far
+        days += 1
+
+    return best_dates[:days], best_weights[:days], best_reps[:days], values[:days], running_pr[:days]
+
+# Compiled kernel, or None without numba. The first call compiles it (or loads it
+# from numba's on-disk cache), so _warm_up_kernel() runs once per worker at startup
+# rather than inside the first large request.
+_compiled_kernel = njit(cache=True)(_analyze_exercise_kernel) if HAVE_NUMBA else None
+
+def _warm_up_kernel():
+    """Compile the numba kernel ahead of the first request that needs it."""
+    one = np.ones(1)
+    for mode in ANALYSIS_MODE_CODES.values():
+        _compiled_kernel(one, one, np.zeros(1, dtype=np.int64), mode)
+
+# Startup side effect: compile on a dedicated daemon thread rather than the parse
+# executor, which may have a single slot (os.cpu_count() == 1) that /api/analyze needs
+if _compiled_kernel is not None:
+    threading.Thread(target=_warm_up_kernel, name="numba-warm-up", daemon=True).start()
+
+def _session_progress_kernel(df_one_ex, analysis_mode, kernel):
+    """session_progress() computed by `kernel` (compiled or plain Python)."""
+    dates_int = df_one_ex["Date"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    order = np.argsort(dates_int, kind="stable")
+    best_dates, best_weights, best_reps, values, running_pr = kernel(
+        df_one_ex["Weight"].to_numpy(dtype=np.float64)[order],
+        df_one_ex["Reps"].to_numpy(dtype=np.float64)[order],
+        dates_int[order],
+        ANALYSIS_MODE_CODES[analysis_mode]
+    )
+    return pd.DataFrame({
+        "Date": best_dates.view("datetime64[ns]"),
+        "Weight": best_weights,
+        "Reps": best_reps.astype(np.int16),
+        "Value": values,
+        "BestSoFar": running_pr
+    })
+
+def _session_progress_pandas(df_one_ex, analysis_mode):
+    """session_progress() computed with vectorized pandas/NumPy operations."""
+    best = best_set_per_day(df_one_ex)
+    best["Value"] = session_values(best, analysis_mode)
+    # Running PR line (never down)
+    best["BestSoFar"] = np.maximum.accumulate(best["Value"].to_numpy())
+    return best
+
+def session_progress(df_one_ex, analysis_mode='weight'):
+    """Best set per day with its plotted Value and running PR (BestSoFar)."""
+    if _compiled_kernel is not None and len(df_one_ex) >= NUMBA_MIN_SETS:
+        return _session_progress_kernel(df_one_ex, analysis_mode, _compiled_kernel)
+    return _session_progress_pandas(df_one_ex, analysis_mode)
 
 def calculate_prs(df_exercise):
     """Calculate personal records for an exercise."""
@@ -65,16 +294,19 @@ def calculate_prs(df_exercise):
         return {}
     
     # Ensure we have valid data
-    df_valid = df_exercise[(df_exercise["Weight"] > 0) & (df_exercise["Reps"] > 0)].copy()
+    df_valid = df_exercise[(df_exercise["Weight"] > 0) & (df_exercise["Reps"] > 0)]
     
     if len(df_valid) == 0:
         return {}
     
-    # Calculate 1RM for each set
-    df_valid["1RM"] = df_valid.apply(lambda r: estimate_1rm(r["Weight"], r["Reps"]), axis=1)
+    # Calculate 1RM and volume for each set (assign returns a new frame, no slice writes)
+    df_valid = df_valid.assign(**{
+        "1RM": estimate_1rm(df_valid["Weight"], df_valid["Reps"]),
+        "Volume": df_valid["Weight"] * df_valid["Reps"]
+    })
     
     # Find highest 1RM
-    max_1rm_row = df_valid.loc[df_valid["1RM"].idxmax()]
+    max_1rm_row = df_valid.iloc[df_valid["1RM"].to_numpy().argmax()]
     pr_1rm = {
         "value": round(max_1rm_row["1RM"], 1),
         "weight": max_1rm_row["Weight"],
@@ -83,9 +315,9 @@ def calculate_prs(df_exercise):
     }
     
     # Find highest weight (prioritizing higher reps for same weight)
-    # Sort by weight descending, then by reps descending
-    df_valid_sorted = df_valid.sort_values(["Weight", "Reps"], ascending=[False, False])
-    max_weight_row = df_valid_sorted.iloc[0]
+    # Composite key ranks by weight first, then reps, in a single linear scan
+    weight_key = df_valid["Weight"].to_numpy() * 1e6 + df_valid["Reps"].to_numpy()
+    max_weight_row = df_valid.iloc[weight_key.argmax()]
     pr_highest_weight = {
         "weight": max_weight_row["Weight"],
         "reps": max_weight_row["Reps"],
@@ -93,8 +325,7 @@ def calculate_prs(df_exercise):
     }
     
     # Find highest volume
-    df_valid["Volume"] = df_valid["Weight"] * df_valid["Reps"]
-    max_volume_row = df_valid.loc[df_valid["Volume"].idxmax()]
+    max_volume_row = df_valid.iloc[df_valid["Volume"].to_numpy().argmax()]
     pr_volume = {
         "value": int(max_volume_row["Volume"]),
         "weight": max_volume_row["Weight"],
@@ -108,65 +339,82 @@ def calculate_prs(df_exercise):
         "volume": pr_volume
     }
 
-def generate_graph_data(best, exercise_name, analysis_mode='weight'):
-    """Generate graph data and create matplotlib plot."""
-    # Compute value column based on analysis mode
+def _thread_axes():
+    """Return this thread's (figure, axes), creating them on first use."""
+    if not hasattr(_plot_state, "fig"):
+        fig = Figure(figsize=(10, 6), dpi=100)
+        FigureCanvasAgg(fig)
+        _plot_state.fig = fig
+        _plot_state.ax = fig.add_subplot(111)
+    return _plot_state.fig, _plot_state.ax
+
+def render_graph_png(dates, values, pr_line, title, y_label, line_label):
+    """Render the progress graph with matplotlib and return it as a base64 PNG."""
+    fig, ax = _thread_axes()
+    ax.clear()
+
+    ax.plot(dates, values, marker="o", label=line_label)
+    ax.plot(dates, pr_line, linestyle="--", label="All-time best so far")
+    ax.fill_between(dates, pr_line, alpha=0.2)
+
+    ax.set_title(title)
+    ax.set_ylabel(y_label)
+    ax.set_xlabel("Date")
+    ax.tick_params(axis="x", labelrotation=45)
+    ax.legend()
+    fig.tight_layout()
+
+    # Convert plot to base64 string
+    img_buffer = io.BytesIO()
+    fig.canvas.print_png(img_buffer)
+    img_str = base64.b64encode(img_buffer.getvalue()).decode()
+
+    return img_str
+
+def generate_graph_data(best, exercise_name, analysis_mode='weight', render_png=False):
+    """Generate graph data from session_progress() output, optionally rendering a plot.
+
+    The browser draws the chart from the returned data, so the (slow) server-side
+    PNG is only produced when render_png is set.
+    """
+    # Labels based on analysis mode
     if analysis_mode == '1rm':
-        best["Value"] = best.apply(lambda r: estimate_1rm(r["Weight"], r["Reps"]), axis=1)
         y_label = "1RM (kg, est.)"
         line_label = "Session 1RM (est.)"
         title_suffix = " (1RM est.)"
     elif analysis_mode == 'volume':
-        best["Value"] = best.apply(lambda r: r["Weight"] * r["Reps"], axis=1)
         y_label = "Volume (kg × reps)"
         line_label = "Session best volume"
         title_suffix = " (Volume)"
     else:  # Default to weight mode
-        best["Value"] = best["Weight"].astype(float)
         y_label = "Weight (kg)"
         line_label = "Session best weight"
         title_suffix = ""
 
-    # Running PR line (never down)
-    best["BestSoFar"] = running_best(best["Value"].tolist())
-
     # Convert dates to strings for JSON serialization
-    dates = [d.isoformat() if hasattr(d, 'isoformat') else str(d) for d in best["Date"].tolist()]
+    dates = best["Date"].dt.strftime("%Y-%m-%d").tolist()
     values = best["Value"].tolist()
     pr_line = best["BestSoFar"].tolist()
-
-    # Create matplotlib plot
-    plt.figure(figsize=(10, 6))
-    plt.plot(dates, values, marker="o", label=line_label)
-    plt.plot(dates, pr_line, linestyle="--", label="All-time best so far")
-    plt.fill_between(dates, pr_line, alpha=0.2)
-
     title = f"Best {exercise_name} per Session{title_suffix}"
-    plt.title(title)
-    plt.ylabel(y_label)
-    plt.xlabel("Date")
-    plt.xticks(rotation=45)
-    plt.legend()
-    plt.tight_layout()
-
-    # Convert plot to base64 string
-    img_buffer = io.BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
-    img_buffer.seek(0)
-    img_str = base64.b64encode(img_buffer.getvalue()).decode()
-    plt.close()
 
-    return {
-        "graph_image": img_str,
+    result = {
         "data": {
             "dates": dates,
             "values": values,
             "pr_line": pr_line,
             "exercise": exercise_name,
-            "analysis_mode": analysis_mode
+            "analysis_mode": analysis_mode,
+            "title": title,
+            "y_label": y_label,
+            "line_label": line_label
         }
     }
 
+    if render_png:
+        result["graph_image"] = render_graph_png(dates, values, pr_line, title, y_label, line_label)
+
+    return result
+
 @app.route('/')
 def index():
     """Serve the main page."""
@@ -257,20 +505,11 @@ def get_exercises():
         if not file.filename.endswith('.csv'):
             return jsonify({"error": "File must be a CSV"}), 400
 
-        # Read CSV
-        df = pd.read_csv(file)
-        
-        # Basic validation
-        required_columns = ["Date", "Exercise Name", "Weight", "Reps"]
-        if not all(col in df.columns for col in required_columns):
-            return jsonify({"error": "CSV must contain Date, Exercise Name, Weight, and Reps columns"}), 400
-
-        # Process dates
-        df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.date
-        df = df.dropna(subset=["Date", "Exercise Name"])
-        
-        # Valid sets only
-        df = df[(df["Weight"] > 0) & (df["Reps"] > 0)]
+        # Read and clean CSV (cached per distinct upload)
+        try:
+            df = load_and_clean(file)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
         exercises = list_exercises(df)
         
@@ -283,9 +522,62 @@ def get_exercises():
     except Exception as e:
         return jsonify({"error": f"Error processing file: {str(e)}"}), 500
 
+def run_analysis(df, exercise_name, analysis_mode, render_png=False):
+    """Build graph data and PRs for one exercise; raises ValueError for bad input."""
+    # Resolve exercise name
+    resolved = resolve_exercise_name(df, exercise_name)
+    if isinstance(resolved, dict) and "error" in resolved:
+        raise ValueError(resolved["error"])
+    
+    chosen_exercise = resolved
+    df_ex = df[df["Exercise Name"] == chosen_exercise]
+    
+    if len(df_ex) == 0:
+        raise ValueError(f"No data found for exercise: {chosen_exercise}")
+    
+    # Build best set per day with its value and running PR
+    best = session_progress(df_ex, analysis_mode)
+    
+    # Calculate personal records
+    prs = calculate_prs(df_ex)
+    
+    # Generate graph data
+    result = generate_graph_data(best, chosen_exercise, analysis_mode, render_png)
+    
+    # Add PRs to the result
+    result["prs"] = prs
+    
+    return result
+
+def _detach_upload(file):
+    """Take the stream out of a request's FileStorage and return it as a new one.
+
+    Flask's request teardown closes uploaded files after the view returns, before
+    a streamed response body is sent. Detaching hands the open stream to the
+    caller, who must close it; request.files[...] is left holding an empty stream.
+    """
+    upload = FileStorage(file.stream, file.filename)
+    file.stream = io.BytesIO()
+    return upload
+
+def _load_and_close(upload):
+    """load_and_clean() for an upload handed over by the request; closes it after."""
+    try:
+        return load_and_clean(upload)
+    finally:
+        upload.close()
+
+def _ndjson_line(payload):
+    """Serialize one newline-delimited JSON message."""
+    return json.dumps(payload) + "\n"
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze_exercise():
-    """Analyze a specific exercise and return graph data."""
+    """Analyze a specific exercise, streaming progress as newline-delimited JSON.
+
+    Emits {"status": "parsing"} and {"status": "computing"} updates, then either
+    {"status": "done", ...result} or {"status": "error", "error": ...}.
+    """
     try:
         if 'file' not in request.files:
             return jsonify({"error": "No file uploaded"}), 400
@@ -302,44 +594,39 @@ def analyze_exercise():
         if analysis_mode not in valid_modes:
             return jsonify({"error": f"Invalid analysis mode. Must be one of: {', '.join(valid_modes)}"}), 400
 
-        # Read CSV
-        df = pd.read_csv(file)
-        
-        # Process dates
-        df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.date
-        df = df.dropna(subset=["Date", "Exercise Name"])
-        
-        # Valid sets only
-        df = df[(df["Weight"] > 0) & (df["Reps"] > 0)]
-        
-        # Resolve exercise name
-        resolved = resolve_exercise_name(df, exercise_name)
-        if isinstance(resolved, dict) and "error" in resolved:
-            return jsonify(resolved), 400
-        
-        chosen_exercise = resolved
-        df_ex = df[df["Exercise Name"] == chosen_exercise].copy()
-        
-        if len(df_ex) == 0:
-            return jsonify({"error": f"No data found for exercise: {chosen_exercise}"}), 400
-        
-        # Build best set per day
-        best = best_set_per_day(df_ex)
-        
-        # Calculate personal records
-        prs = calculate_prs(df_ex)
-        
-        # Generate graph data
-        result = generate_graph_data(best, chosen_exercise, analysis_mode)
-        
-        # Add PRs to the result
-        result["prs"] = prs
-        
-        return jsonify(result)
+        # Server-side PNG only on ?render=png
+        render_png = request.args.get('render') == 'png'
+
+        # The upload must outlive the request, so the parse job takes ownership of it
+        upload = _detach_upload(file)
+
+        # Start reading and cleaning the CSV (cached per distinct upload) right away,
+        # so parsing overlaps with sending the response headers and first status line
+        try:
+            parse_job = executor.submit(_load_and_close, upload)
+        except Exception:
+            upload.close()
+            raise
         
     except Exception as e:
         return jsonify({"error": f"Error analyzing exercise: {str(e)}"}), 500
 
+    def generate():
+        try:
+            yield _ndjson_line({"status": "parsing"})
+            df = parse_job.result()
+
+            yield _ndjson_line({"status": "computing"})
+            result = run_analysis(df, exercise_name, analysis_mode, render_png)
+
+            yield _ndjson_line({"status": "done", **result})
+        except ValueError as e:
+            yield _ndjson_line({"status": "error", "error": str(e)})
+        except Exception as e:
+            yield _ndjson_line({"status": "error", "error": f"Error analyzing exercise: {str(e)}"})
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/api/weekly-summary', methods=['POST'])
 def weekly_summary():
     """Generate weekly workout summary."""
@@ -349,23 +636,22 @@ def weekly_summary():
         
         file = request.files['file']
         
-        # Read CSV
-        df = pd.read_csv(file)
-        
-        # Process dates
-        df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.date
-        df = df.dropna(subset=["Date", "Exercise Name"])
-        
-        # Valid sets only
-        df = df[(df["Weight"] > 0) & (df["Reps"] > 0)]
-        
-        # Group by week
-        df["Week"] = pd.to_datetime(df["Date"]).dt.isocalendar().week
-        df["Year"] = pd.to_datetime(df["Date"]).dt.isocalendar().year
+        # Read and clean CSV (cached per distinct upload)
+        try:
+            df = load_and_clean(file)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        # Group by week (assign keeps the cached frame untouched)
+        iso = df["Date"].dt.isocalendar()
+        df = df.assign(
+            Week=iso["week"].astype("int16"),
+            Year=iso["year"].astype("int16")
+        )
         
         weekly_counts = df.groupby(["Year", "Week"]).size().reset_index(name="workouts")
-        weekly_counts["date_range"] = weekly_counts.apply(
-            lambda x: f"Week {x['Week']}, {x['Year']}", axis=1
+        weekly_counts["date_range"] = (
+            "Week " + weekly_counts["Week"].astype(str) + ", " + weekly_counts["Year"].astype(str)
         )
         
         return jsonify({
@@ -376,4 +662,5 @@ def weekly_summary():
         return jsonify({"error": f"Error generating weekly summary: {str(e)}"}), 500
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=8080)
+    # Development server only; production runs under gunicorn (see Dockerfile)
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', host='0.0.0.0', port=8080)
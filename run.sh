@@ -22,4 +22,5 @@ echo "Open http://localhost:8080 in your browser"
 echo "Press Ctrl+C to stop the server"
 echo ""
 
-python3 app.py
+# Local development server with the reloader and debugger enabled
+FLASK_DEBUG=1 python3 app.py
@@ -4,6 +4,7 @@ class GymTracker {
     constructor() {
         this.currentFile = null;
         this.exercises = [];
+        this.progressChart = null;
         this.init();
     }
 
@@ -189,20 +190,57 @@ class GymTracker {
                 body: formData
             });
 
-            const data = await response.json();
-
-            if (response.ok) {
-                this.displayResults(data);
-                this.hideLoading();
-            } else {
+            if (!response.ok) {
+                const data = await response.json();
                 throw new Error(data.error || 'Failed to analyze exercise');
             }
+
+            const data = await this.readAnalysisStream(response);
+            this.displayResults(data);
+            this.hideLoading();
         } catch (error) {
             this.hideLoading();
             this.showError(`Error analyzing exercise: ${error.message}`);
         }
     }
 
+    async readAnalysisStream(response) {
+        // The analyze endpoint streams newline-delimited JSON progress updates,
+        // ending with either the full result or an error
+        const progressMessages = {
+            'parsing': 'Reading CSV file...',
+            'computing': 'Analyzing exercise...'
+        };
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+            buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+
+            const lines = buffer.split('\n');
+            buffer = done ? '' : lines.pop();
+
+            for (const line of lines) {
+                if (!line.trim()) continue;
+
+                const message = JSON.parse(line);
+                if (message.status === 'error') {
+                    throw new Error(message.error || 'Failed to analyze exercise');
+                }
+                if (message.status === 'done') {
+                    return message;
+                }
+                this.showLoading(progressMessages[message.status] || 'Analyzing exercise...');
+            }
+
+            if (done) break;
+        }
+
+        throw new Error('Analysis ended unexpectedly');
+    }
+
     displayResults(data) {
         const resultsSection = document.getElementById('resultsSection');
         const graphContainer = document.getElementById('graphContainer');
@@ -217,13 +255,17 @@ class GymTracker {
         };
         const modeName = modeNames[data.data.analysis_mode] || data.data.analysis_mode;
 
-        // Display the graph image
+        // Use the server-rendered image if one was requested, otherwise draw the chart here
+        const graph = data.graph_image
+            ? `<img src="data:image/png;base64,${data.graph_image}" 
+                     alt="Exercise Progress Graph" 
+                     class="max-w-full h-auto mx-auto">`
+            : '<canvas id="progressChart" aria-label="Exercise Progress Graph"></canvas>';
+
         graphContainer.innerHTML = `
             <div class="graph-container">
                 <h4 class="text-lg font-semibold mb-4">${data.data.exercise} Progress</h4>
-                <img src="data:image/png;base64,${data.graph_image}" 
-                     alt="Exercise Progress Graph" 
-                     class="max-w-full h-auto mx-auto">
+                ${graph}
                 <div class="mt-4 text-sm text-gray-600">
                     <p>Analysis Mode: ${modeName}</p>
                     <p>Data Points: ${data.data.dates.length}</p>
@@ -231,6 +273,10 @@ class GymTracker {
             </div>
         `;
 
+        if (!data.graph_image) {
+            this.renderProgressChart(data.data);
+        }
+
         // Display Personal Records
         if (data.prs && Object.keys(data.prs).length > 0) {
             prContainer.innerHTML = `
@@ -263,6 +309,48 @@ class GymTracker {
         resultsSection.classList.remove('hidden');
     }
 
+    renderProgressChart(graphData) {
+        if (this.progressChart) {
+            this.progressChart.destroy();
+        }
+
+        const ctx = document.getElementById('progressChart').getContext('2d');
+        this.progressChart = new Chart(ctx, {
+            type: 'line',
+            data: {
+                labels: graphData.dates,
+                datasets: [
+                    {
+                        label: graphData.line_label,
+                        data: graphData.values,
+                        borderColor: 'rgb(37, 99, 235)',
+                        backgroundColor: 'rgb(37, 99, 235)',
+                        pointRadius: 3
+                    },
+                    {
+                        label: 'All-time best so far',
+                        data: graphData.pr_line,
+                        borderColor: 'rgb(234, 88, 12)',
+                        backgroundColor: 'rgba(234, 88, 12, 0.2)',
+                        borderDash: [6, 4],
+                        pointRadius: 0,
+                        fill: 'origin'
+                    }
+                ]
+            },
+            options: {
+                responsive: true,
+                plugins: {
+                    title: { display: true, text: graphData.title }
+                },
+                scales: {
+                    x: { title: { display: true, text: 'Date' } },
+                    y: { title: { display: true, text: graphData.y_label } }
+                }
+            }
+        });
+    }
+
     showLoading(message) {
         // Create or update loading indicator
         let loading = document.getElementById('loading');